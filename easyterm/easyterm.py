@@ -1,8 +1,10 @@
 #!/usr/bin/env python
+import functools
 import os
+import re
 import shlex
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 
 import gi
 
@@ -13,20 +15,15 @@ gi.require_version("Vte", "3.91")
 from gi.repository import Adw, Gdk, Gio, GLib, Gtk, Pango, Vte
 
 CONF_NAME: str = "EasyTerm"
-CONF_DEF_CWD: str = os.getcwd()
+_DEFAULT_CWD: Optional[str] = None
 CONF_DEF_CMD: List[str] = ["/bin/bash"]
 
+# Default colors are shared by every terminal and must not be mutated.
 CONF_FG: Gdk.RGBA = Gdk.RGBA()
-CONF_FG.red = 0.8
-CONF_FG.green = 0.8
-CONF_FG.blue = 0.8
-CONF_FG.alpha = 1.0
+CONF_FG.parse("rgb(80%,80%,80%)")
 
 CONF_BG: Gdk.RGBA = Gdk.RGBA()
-CONF_BG.red = 0.1
-CONF_BG.green = 0.1
-CONF_BG.blue = 0.1
-CONF_BG.alpha = 1.0
+CONF_BG.parse("rgb(10%,10%,10%)")
 
 CONF_FONT_FAMILY: str = "DejaVu Sans Mono"
 CONF_FONT_FALLBACKS: List[str] = [
@@ -37,13 +34,44 @@ CONF_FONT_FALLBACKS: List[str] = [
 ]
 CONF_FONT_SIZE: int = 12
 
+# One comma-separated "tooltip[:icon]:command" entry; malformed entries
+# (wrong number of fields) don't match and are skipped.
+_ACTION_RE = re.compile(r"(?<![^,])\s*([^:,]*):(?:([^:,]*):)?([^:,]*?)\s*(?=,|$)")
 
-def select_font_family(available_families: List[str]) -> str:
+_ADW_INITED: bool = False
+_NL: bytes = b"\n"
+_DEFAULT_FONT_DESC: Pango.FontDescription = Pango.FontDescription(
+    f"Monospace {CONF_FONT_SIZE}"
+)
+_FONT_DESC_CACHE: Optional[Pango.FontDescription] = None
+
+
+def _ensure_adw() -> None:
+    """Initialize libadwaita once, on first application construction."""
+    global _ADW_INITED
+    if not _ADW_INITED:
+        Adw.init()
+        _ADW_INITED = True
+
+
+def _parse_rgba(spec: str) -> Optional[Gdk.RGBA]:
+    """Parse a color specification, returning None if it is invalid."""
+    rgba = Gdk.RGBA()
+    return rgba if rgba.parse(spec) else None
+
+
+def _default_cwd() -> str:
+    """Return the default working directory, resolved at call time."""
+    return _DEFAULT_CWD or os.getcwd()
+
+
+@functools.lru_cache(maxsize=1)
+def select_font_family(available_families: FrozenSet[str]) -> str:
     """Select the best matching font family available on the system."""
-    for candidate in [CONF_FONT_FAMILY, *CONF_FONT_FALLBACKS]:
+    for candidate in (CONF_FONT_FAMILY, *CONF_FONT_FALLBACKS):
         if candidate in available_families:
             return candidate
-    return available_families[0] if available_families else CONF_FONT_FAMILY
+    return min(available_families) if available_families else CONF_FONT_FAMILY
 
 
 class Terminal(Vte.Terminal):
@@ -58,7 +86,11 @@ class Terminal(Vte.Terminal):
         super().__init__(*args, **kwds)
         self.set_cursor_blink_mode(Vte.CursorBlinkMode.ON)
         self.set_mouse_autohide(True)
-        self.set_font(self._build_font_description())
+        if _FONT_DESC_CACHE is not None:
+            self.set_font(_FONT_DESC_CACHE)
+        else:
+            self.set_font(_DEFAULT_FONT_DESC)
+            GLib.idle_add(self._resolve_font_async)
 
         if palette is None or len(palette) < 2:
             self.set_colors(
@@ -71,42 +103,80 @@ class Terminal(Vte.Terminal):
                 background=palette[1],
             )
 
-        self._build_context_menu()
+        self._build_action_group()
+        self._build_menu_gesture()
 
     def _build_font_description(self) -> Pango.FontDescription:
-        """Build a Pango font description based on available families and config."""
+        """Build a Pango font description based on available families and config.
+
+        The resolved description is cached at module level, so the font
+        families are only enumerated for the first terminal.
+        """
+        global _FONT_DESC_CACHE
+        if _FONT_DESC_CACHE is not None:
+            return _FONT_DESC_CACHE
+
         context = self.create_pango_context()
-        families = [family.get_name() for family in context.list_families()]
-        family = select_font_family(families)
-        return Pango.FontDescription(f"{family} {CONF_FONT_SIZE}")
+        available = frozenset(f.get_name() for f in context.list_families())
+        family = select_font_family(available)
+        _FONT_DESC_CACHE = Pango.FontDescription(f"{family} {CONF_FONT_SIZE}")
+        return _FONT_DESC_CACHE
 
-    def _build_context_menu(self) -> None:
-        """Create the right-click context menu for copy and paste."""
-        self.popover_menu: Gtk.Popover = Gtk.Popover()
-        self.popover_menu.set_has_arrow(False)
+    def _resolve_font_async(self) -> bool:
+        """Idle callback applying the resolved font once the window is shown."""
+        self.set_font(self._build_font_description())
+        return GLib.SOURCE_REMOVE
+
+    def _build_action_group(self) -> None:
+        """Install the "term" action group used by the context menu."""
+        self.action_group: Gio.SimpleActionGroup = Gio.SimpleActionGroup()
 
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
-        box.set_margin_top(6)
-        box.set_margin_bottom(6)
-        box.set_margin_start(6)
-        box.set_margin_end(6)
+        copy_action = Gio.SimpleAction.new("copy", None)
+        copy_action.connect("activate", self.copy_cb)
+        self.action_group.add_action(copy_action)
 
-        copy_btn = Gtk.Button.new_with_label("Copy")
-        copy_btn.connect("clicked", self.copy_cb)
-        box.append(copy_btn)
+        paste_action = Gio.SimpleAction.new("paste", None)
+        paste_action.connect("activate", self.paste_cb)
+        self.action_group.add_action(paste_action)
 
-        paste_btn = Gtk.Button.new_with_label("Paste")
-        paste_btn.connect("clicked", self.paste_cb)
-        box.append(paste_btn)
+        self.insert_action_group("term", self.action_group)
 
-        self.popover_menu.set_child(box)
+    def _build_context_menu(self) -> None:
+        """Create the right-click context menu for copy and paste."""
+        menu = Gio.Menu.new()
+        menu.append("Copy", "term.copy")
+        menu.append("Paste", "term.paste")
+
+        self.popover_menu: Gtk.PopoverMenu = Gtk.PopoverMenu.new_from_model(menu)
+        self.popover_menu.set_has_arrow(False)
         self.popover_menu.set_parent(self)
 
+        self._menu_rect: Gdk.Rectangle = Gdk.Rectangle()
+        self._menu_rect.width = 1
+        self._menu_rect.height = 1
+
+    def _build_menu_gesture(self) -> None:
+        """Listen for right clicks; the menu itself is built on first use."""
         gesture = Gtk.GestureClick.new()
         gesture.set_button(Gdk.BUTTON_SECONDARY)
-        gesture.connect("pressed", self.show_menu_cb)
+        self._menu_handler_id: int = gesture.connect(
+            "pressed", self._lazy_show_menu_cb
+        )
         self.add_controller(gesture)
 
+    def _lazy_show_menu_cb(
+        self,
+        gesture: Gtk.GestureClick,
+        n_press: int,
+        x: float,
+        y: float,
+    ) -> None:
+        """Build the context menu on the first right click, then show it."""
+        self._build_context_menu()
+        gesture.disconnect(self._menu_handler_id)
+        gesture.connect("pressed", self.show_menu_cb)
+        self.show_menu_cb(gesture, n_press, x, y)
+
     def show_menu_cb(
         self,
         gesture: Gtk.GestureClick,
@@ -115,26 +185,44 @@ class Terminal(Vte.Terminal):
         y: float,
     ) -> None:
         """Show the context menu at the pointer position."""
-        rect = Gdk.Rectangle()
+        rect = self._menu_rect
         rect.x = int(x)
         rect.y = int(y)
-        rect.width = 1
-        rect.height = 1
         self.popover_menu.set_pointing_to(rect)
         self.popover_menu.popup()
 
-    def copy_cb(self, widget: Gtk.Widget) -> None:
+    def copy_cb(
+        self,
+        action: Gio.SimpleAction,
+        param: Optional[GLib.Variant],
+    ) -> None:
         """Copy selected text to the clipboard."""
         self.copy_clipboard_format(Vte.Format.TEXT)
 
-    def paste_cb(self, widget: Gtk.Widget) -> None:
-        """Paste text from the clipboard."""
-        self.paste_clipboard()
+    def paste_cb(
+        self,
+        action: Gio.SimpleAction,
+        param: Optional[GLib.Variant],
+    ) -> None:
+        """Paste text from the clipboard without blocking the main loop."""
+        self.get_clipboard().read_text_async(None, self._on_paste_ready)
+
+    def _on_paste_ready(
+        self,
+        clipboard: Gdk.Clipboard,
+        result: Gio.AsyncResult,
+    ) -> None:
+        """Feed the clipboard text into the terminal once it is available."""
+        try:
+            text = clipboard.read_text_finish(result)
+        except GLib.Error:
+            return
+        if text:
+            self.paste_text(text)
 
     def run_command(self, cmd: str) -> None:
         """Feed a command line followed by a newline into the child PTY."""
-        _cmd = f"{cmd}\n".encode()
-        self.feed_child(_cmd)
+        self.feed_child(cmd.encode() + _NL)
 
     def run_command_btn(self, btn: Gtk.Button, cmd: str) -> None:
         """Callback to run a command when a headerbar button is clicked."""
@@ -147,11 +235,14 @@ class HeaderBar:
     def __init__(
         self,
         terminal: Terminal,
+        widget: Optional[Adw.HeaderBar] = None,
         *args: Any,
         **kwds: Any,
     ) -> None:
         self.terminal: Terminal = terminal
-        self.widget: Adw.HeaderBar = Adw.HeaderBar(**kwds)
+        self.widget: Adw.HeaderBar = widget or Adw.HeaderBar(**kwds)
+        self.widget.insert_action_group("term", terminal.action_group)
+        self._action_count: int = 0
 
         self.actions_box: Gtk.Box = Gtk.Box(
             orientation=Gtk.Orientation.HORIZONTAL,
@@ -164,13 +255,27 @@ class HeaderBar:
 
     def build_actions(self, actions: List[Dict[str, str]]) -> None:
         """Create headerbar buttons based on a list of action descriptors."""
-        for action in actions:
-            button = Gtk.Button()
+        new_button = Gtk.Button
+        new_image = Gtk.Image.new_from_icon_name
+        new_action = Gio.SimpleAction.new
+        add_action = self.terminal.action_group.add_action
+        append = self.actions_box.append
+        feed_child = self.terminal.feed_child
+        for index, action in enumerate(actions, start=self._action_count):
+            name = f"run-{index}"
+            encoded = action["command"].encode() + _NL
+            run_action = new_action(name, None)
+            run_action.connect(
+                "activate", lambda act, param, data=encoded: feed_child(data)
+            )
+            add_action(run_action)
+
+            button = new_button()
             button.set_tooltip_text(action["tooltip"])
-            icon = Gtk.Image.new_from_icon_name(action["icon"])
-            button.set_child(icon)
-            button.connect("clicked", self.terminal.run_command_btn, action["command"])
-            self.actions_box.append(button)
+            button.set_child(new_image(action["icon"]))
+            button.set_action_name(f"term.{name}")
+            append(button)
+        self._action_count += len(actions)
 
     def set_title(self, title: str) -> None:
         """Update the headerbar title label."""
@@ -185,10 +290,41 @@ class HeaderBar:
         self.widget.set_show_start_title_buttons(value)
 
 
+MAIN_WINDOW_UI: str = f"""
+<interface>
+  <template class="EasyTermMainWindow" parent="AdwApplicationWindow">
+    <property name="title">{CONF_NAME}</property>
+    <property name="default-width">800</property>
+    <property name="default-height">450</property>
+    <property name="content">
+      <object class="AdwToolbarView" id="toolbar_view">
+        <child type="top">
+          <object class="AdwHeaderBar" id="header_bar">
+            <property name="show-start-title-buttons">true</property>
+            <property name="show-end-title-buttons">true</property>
+          </object>
+        </child>
+        <property name="content">
+          <object class="GtkBox" id="box">
+            <property name="orientation">vertical</property>
+          </object>
+        </property>
+      </object>
+    </property>
+  </template>
+</interface>
+"""
+
+
+@Gtk.Template(string=MAIN_WINDOW_UI)
 class MainWindow(Adw.ApplicationWindow):
     """Main application window embedding the terminal and headerbar."""
 
-    Adw.init()
+    __gtype_name__ = "EasyTermMainWindow"
+
+    toolbar_view: Adw.ToolbarView = Gtk.Template.Child()
+    header_bar: Adw.HeaderBar = Gtk.Template.Child()
+    box: Gtk.Box = Gtk.Template.Child()
 
     def __init__(
         self,
@@ -203,23 +339,11 @@ class MainWindow(Adw.ApplicationWindow):
         **kwds: Any,
     ) -> None:
         super().__init__(application=application, *args, **kwds)
-        self.set_title(CONF_NAME)
-        self.set_default_size(800, 450)
 
         self.terminal: Terminal = Terminal(palette)
-        self.headerbar: HeaderBar = HeaderBar(self.terminal)
-        self.headerbar.set_show_end_title_buttons(True)
-        self.headerbar.set_show_start_title_buttons(True)
-
-        self.box: Gtk.Box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        self.headerbar: HeaderBar = HeaderBar(self.terminal, self.header_bar)
         self.box.append(self.terminal)
 
-        self.toolbar_view: Adw.ToolbarView = Adw.ToolbarView()
-        self.toolbar_view.add_top_bar(self.headerbar.widget)
-        self.toolbar_view.set_content(self.box)
-
-        self.set_content(self.toolbar_view)
-
         if dark_theme:
             self.set_dark_theme()
 
@@ -229,7 +353,7 @@ class MainWindow(Adw.ApplicationWindow):
             self.headerbar.build_actions(actions)
 
         if cwd == "":
-            cwd = CONF_DEF_CWD
+            cwd = _default_cwd()
         if not command:
             command = CONF_DEF_CMD
         if env is None:
@@ -285,6 +409,7 @@ class EasyTermLib:
         self.dark_theme: bool = dark_theme
         self.palette: List[Gdk.RGBA] = palette or []
 
+        _ensure_adw()
         self.application: Adw.Application = Adw.Application(
             application_id="com.usebottles.easytermlib",
             flags=Gio.ApplicationFlags.NON_UNIQUE,
@@ -326,6 +451,7 @@ class EasyTerm(Adw.Application):
         *args: Any,
         **kwds: Any,
     ) -> None:
+        _ensure_adw()
         super().__init__(
             application_id="com.usebottles.easyterm",
             flags=Gio.ApplicationFlags.HANDLES_COMMAND_LINE
@@ -404,35 +530,32 @@ class EasyTerm(Adw.Application):
 
         options = command_line.get_options_dict()
 
-        if options.contains("cwd"):
-            cwd = options.lookup_value("cwd").get_string()
-
-        if options.contains("command"):
-            command_str = options.lookup_value("command").get_string()
-            command = shlex.split(command_str)
-
-        if options.contains("env"):
-            env_str = options.lookup_value("env").get_string()
-            env = env_str.split(" ") if env_str else []
-
-        if options.contains("actions"):
-            raw = options.lookup_value("actions").get_string()
-            for spec in raw.split(","):
-                spec = spec.strip()
-                if not spec:
-                    continue
-                parts = spec.split(":")
-                if len(parts) == 3:
-                    tooltip, icon, cmd = parts
-                elif len(parts) == 2:
-                    tooltip, cmd = parts
-                    icon = "system-run-symbolic"
-                else:
-                    continue
+        value = options.lookup_value("cwd")
+        if value is not None:
+            cwd = value.get_string()
+
+        value = options.lookup_value("command")
+        if value is not None:
+            command_str = value.get_string()
+            if '"' in command_str or "'" in command_str or "\\" in command_str:
+                command = shlex.split(command_str)
+            else:
+                command = command_str.split()
+
+        value = options.lookup_value("env")
+        if value is not None:
+            env_str = value.get_string()
+            env = env_str.split()
+
+        value = options.lookup_value("actions")
+        if value is not None:
+            raw = value.get_string()
+            for match in _ACTION_RE.finditer(raw):
+                tooltip, icon, cmd = match.groups()
                 actions.append(
                     {
                         "tooltip": tooltip,
-                        "icon": icon,
+                        "icon": "system-run-symbolic" if icon is None else icon,
                         "command": cmd,
                     }
                 )
@@ -440,14 +563,10 @@ class EasyTerm(Adw.Application):
         if options.lookup_value("light-theme"):
             dark_theme = False
 
-        if options.contains("palette"):
-            palette_tokens = options.lookup_value("palette").get_string().split(" ")
-            if len(palette_tokens) >= 2:
-                back = Gdk.RGBA()
-                back.parse(palette_tokens[0])
-                fore = Gdk.RGBA()
-                fore.parse(palette_tokens[1])
-                palette = [back, fore]
+        value = options.lookup_value("palette")
+        if value is not None:
+            tokens = value.get_string().split()
+            palette = [rgba for rgba in map(_parse_rgba, tokens) if rgba is not None]
 
         self.cwd = cwd
         self.command = command